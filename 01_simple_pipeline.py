@@ -15,74 +15,202 @@ DLT simplifies data ingestion by:
 - Multiple destination support
 """
 
+import argparse
+import logging
+import logging.handlers
+import sys
+import os
 import dlt
-from typing import Iterator, Dict, Any
+from dlt.pipeline.exceptions import PipelineStepFailed
+from typing import Iterator, List, Dict, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from operator import itemgetter
+import orjson
+import pyarrow as pa
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+# Arrow tables skip DLT's row normalizer, so ask the parquet normalizer
+# to add the _dlt_load_id and _dlt_id columns every DLT table carries
+os.environ.setdefault('NORMALIZE__PARQUET_NORMALIZER__ADD_DLT_LOAD_ID', 'true')
+os.environ.setdefault('NORMALIZE__PARQUET_NORMALIZER__ADD_DLT_ID', 'true')
 
-def load_users() -> Iterator[Dict[str, Any]]:
+log = logging.getLogger(__name__)
+
+
+# One session for all API calls keeps the connection alive between requests
+# Failed GETs are retried with exponential backoff
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["GET"])
+    )
+))
+
+
+# Explicit Arrow schemas lock the column types DLT sees
+USERS_SCHEMA = pa.schema([
+    ('user_id', pa.int64()),
+    ('name', pa.string()),
+    ('username', pa.string()),
+    ('email', pa.string()),
+    ('phone', pa.string()),
+    ('website', pa.string()),
+    ('street', pa.string()),
+    ('suite', pa.string()),
+    ('city', pa.string()),
+    ('zipcode', pa.string()),
+    ('latitude', pa.string()),
+    ('longitude', pa.string()),
+    ('company_name', pa.string()),
+    ('company_catchphrase', pa.string()),
+    ('company_bs', pa.string())
+])
+
+# Field getters for flattening a user, in USERS_SCHEMA column order
+_USER_FIELDS = itemgetter('id', 'name', 'username', 'email', 'phone', 'website')
+_ADDRESS_FIELDS = itemgetter('street', 'suite', 'city', 'zipcode')
+_GEO_FIELDS = itemgetter('lat', 'lng')
+_COMPANY_FIELDS = itemgetter('name', 'catchPhrase', 'bs')
+
+POSTS_SCHEMA = pa.schema([
+    ('post_id', pa.int64()),
+    ('user_id', pa.int64()),
+    ('title', pa.string()),
+    ('body', pa.string())
+])
+
+
+# A batch below this share of the previous run's size is treated as an outage
+PHANTOM_ZERO_THRESHOLD = 0.1
+
+
+class PhantomZeroError(RuntimeError):
     """
-    A DLT resource that loads users from API
+    Raised when an API returns far fewer records than the previous run
     
-    In DLT terminology:
-    - Resource: A function that yields data
-    - Yields: Produces data one record at a time
+    Carries the dead letter record that describes the rejected batch
+    """
+    
+    def __init__(self, dead_letter: Dict[str, Any]) -> None:
+        super().__init__(
+            f"{dead_letter['resource']}: expected about {dead_letter['expected']} "
+            f"records, got {dead_letter['got']}"
+        )
+        self.dead_letter = dead_letter
+
+
+def data_volume_sensor(resource_name: str, row_count: int) -> None:
+    """
+    Compare the incoming row count with the previous run before yielding
+    
+    With write_disposition='replace', an API outage that returns []
+    would silently empty the table (the "Phantom Zero" failure)
+    
+    The counts live in the source state: DLT resets the resource state
+    of 'replace' resources on every run
     """
     
-    print("📡 Fetching users from API...")
+    last_counts = dlt.current.source_state().setdefault('last_counts', {})
+    last_count = last_counts.get(resource_name)
+    
+    if last_count and row_count < PHANTOM_ZERO_THRESHOLD * last_count:
+        raise PhantomZeroError({
+            'resource': resource_name,
+            'expected': last_count,
+            'got': row_count,
+            'detected_at': datetime.now(timezone.utc).isoformat()
+        })
+    
+    last_counts[resource_name] = row_count
+
+
+def find_phantom_zero(exc: BaseException) -> Optional[PhantomZeroError]:
+    """
+    Find a PhantomZeroError in the chain of exceptions DLT wraps it in
+    """
+    
+    while exc is not None:
+        if isinstance(exc, PhantomZeroError):
+            return exc
+        exc = exc.__cause__ or exc.__context__
+    return None
+
+
+def fetch_json(endpoint: str) -> List[Dict[str, Any]]:
+    """
+    Fetch one JSONPlaceholder endpoint and return the parsed records
+    """
+    
+    log.info("📡 Fetching %s from API...", endpoint)
     
     # Make API call
-    response = requests.get("https://jsonplaceholder.typicode.com/users")
+    response = _SESSION.get(
+        f"https://jsonplaceholder.typicode.com/{endpoint}",
+        timeout=(3.05, 30)
+    )
     response.raise_for_status()
     
-    users = response.json()
-    
-    print(f"✅ Found {len(users)} users")
-    
-    # Yield each user
-    # DLT will process them automatically
-    for user in users:
-        # Flatten the nested structure for the warehouse
-        yield {
-            'user_id': user['id'],
-            'name': user['name'],
-            'username': user['username'],
-            'email': user['email'],
-            'phone': user['phone'],
-            'website': user['website'],
-            'street': user['address']['street'],
-            'suite': user['address']['suite'],
-            'city': user['address']['city'],
-            'zipcode': user['address']['zipcode'],
-            'latitude': user['address']['geo']['lat'],
-            'longitude': user['address']['geo']['lng'],
-            'company_name': user['company']['name'],
-            'company_catchphrase': user['company']['catchPhrase'],
-            'company_bs': user['company']['bs']
-        }
-
-
-def load_posts() -> Iterator[Dict[str, Any]]:
+    # orjson parses the raw body much faster than the stdlib json module
+    return orjson.loads(response.content)
+
+
+def load_users(users: List[Dict[str, Any]]) -> Iterator[pa.Table]:
     """
-    A DLT resource that loads posts from API
+    A DLT resource that loads users fetched from the API
+    
+    In DLT terminology:
+    - Resource: A function that yields data
+    - Yields: Produces data, here as a single Arrow table
     """
     
-    print("📡 Fetching posts from API...")
+    log.info("✅ Found %s users", len(users))
     
-    response = requests.get("https://jsonplaceholder.typicode.com/posts")
-    response.raise_for_status()
+    # Refuse to replace the table with a suspiciously small batch
+    data_volume_sensor("users", len(users))
+    
+    # Flatten the nested structure into one tuple per user
+    rows = [
+        (
+            *_USER_FIELDS(user),
+            *_ADDRESS_FIELDS(user['address']),
+            *_GEO_FIELDS(user['address']['geo']),
+            *_COMPANY_FIELDS(user['company'])
+        )
+        for user in users
+    ]
     
-    posts = response.json()
+    # Transpose the rows into columns and yield one table
+    # DLT loads Arrow tables directly instead of normalizing row by row
+    columns = list(zip(*rows)) or [()] * len(USERS_SCHEMA)
+    yield pa.Table.from_arrays(
+        [pa.array(column, type=field.type) for column, field in zip(columns, USERS_SCHEMA)],
+        schema=USERS_SCHEMA
+    )
+
+
+def load_posts(posts: List[Dict[str, Any]]) -> Iterator[pa.Table]:
+    """
+    A DLT resource that loads posts fetched from the API
+    """
     
-    print(f"✅ Found {len(posts)} posts")
+    log.info("✅ Found %s posts", len(posts))
     
-    for post in posts:
-        yield {
-            'post_id': post['id'],
-            'user_id': post['userId'],
-            'title': post['title'],
-            'body': post['body']
-        }
+    data_volume_sensor("posts", len(posts))
+    
+    yield pa.table({
+        'post_id': [post['id'] for post in posts],
+        'user_id': [post['userId'] for post in posts],
+        'title': [post['title'] for post in posts],
+        'body': [post['body'] for post in posts]
+    }, schema=POSTS_SCHEMA)
 
 
 @dlt.source(name="jsonplaceholder")
@@ -95,10 +223,23 @@ def jsonplaceholder_source():
     - @dlt.source: Decorator that marks this as a DLT source
     """
     
-    return [
-        dlt.resource(load_users(), name="users", write_disposition="replace"),
-        dlt.resource(load_posts(), name="posts", write_disposition="replace")
-    ]
+    # Both endpoints are independent, so fetch them at the same time
+    # Wall time becomes the slower request instead of the sum of both
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        users_future = executor.submit(fetch_json, "users")
+        posts_future = executor.submit(fetch_json, "posts")
+        users = users_future.result()
+        posts = posts_future.result()
+    
+    # One resource for both endpoints, each table is routed by name
+    # DLT runs a single extract pass instead of one per endpoint
+    def load_all() -> Iterator[pa.Table]:
+        for table in load_users(users):
+            yield dlt.mark.with_table_name(table, "users")
+        for table in load_posts(posts):
+            yield dlt.mark.with_table_name(table, "posts")
+    
+    return dlt.resource(load_all(), name="jsonplaceholder", write_disposition="replace")
 
 
 def run_pipeline_to_duckdb():
@@ -107,9 +248,9 @@ def run_pipeline_to_duckdb():
     DuckDB is great for learning because it requires no setup
     """
     
-    print("\n" + "=" * 60)
-    print("RUNNING DLT PIPELINE TO DUCKDB")
-    print("=" * 60)
+    log.info("\n" + "=" * 60)
+    log.info("RUNNING DLT PIPELINE TO DUCKDB")
+    log.info("=" * 60)
     
     # Create a pipeline
     # Think of a pipeline as a "job" that moves data from source to destination
@@ -120,59 +261,92 @@ def run_pipeline_to_duckdb():
     )
     
     # Run the pipeline
-    print("\n🚀 Starting pipeline run...")
+    log.info("\n🚀 Starting pipeline run...")
     
-    load_info = pipeline.run(jsonplaceholder_source())
+    # Parquet files are loaded by DuckDB with a single COPY per table
+    # instead of INSERT statements
+    try:
+        load_info = pipeline.run(jsonplaceholder_source(), loader_file_format="parquet")
+    except PipelineStepFailed as exc:
+        phantom_zero = find_phantom_zero(exc)
+        if phantom_zero is None:
+            raise
+        
+        # Keep the existing tables and record the rejected batch
+        # in the dead letter queue (dlq) table for follow-up
+        log.error("\n🚨 Data volume check failed: %s", phantom_zero)
+        pipeline.run([phantom_zero.dead_letter], table_name="dlq", write_disposition="append")
+        log.info("   Rejected batch recorded in the dlq table")
+        raise
     
     # Print results
-    print("\n" + "=" * 60)
-    print("PIPELINE COMPLETED")
-    print("=" * 60)
+    log.info("\n" + "=" * 60)
+    log.info("PIPELINE COMPLETED")
+    log.info("=" * 60)
     
-    print(f"\n✅ Pipeline: {load_info.pipeline.pipeline_name}")
-    print(f"✅ Destination: {load_info.pipeline.destination}")
-    print(f"✅ Dataset: {load_info.pipeline.dataset_name}")
+    log.info("\n✅ Pipeline: %s", load_info.pipeline.pipeline_name)
+    log.info("✅ Destination: %s", load_info.pipeline.destination)
+    log.info("✅ Dataset: %s", load_info.pipeline.dataset_name)
     
     # Show what was loaded
-    print(f"\n📊 Load Summary:")
+    log.info("\n📊 Load Summary:")
     for package in load_info.load_packages:
-        print(f"\nPackage: {package.package_id}")
+        log.info("\nPackage: %s", package.package_id)
         for table_name, table_info in package.schema_update.items():
-            print(f"  Table: {table_name}")
+            log.info("  Table: %s", table_name)
     
     # Access the loaded data
-    print("\n" + "=" * 60)
-    print("QUERYING LOADED DATA")
-    print("=" * 60)
+    log.info("\n" + "=" * 60)
+    log.info("QUERYING LOADED DATA")
+    log.info("=" * 60)
     
     # DuckDB connection
     with pipeline.sql_client() as client:
-        # Query users
-        print("\n📊 Sample Users:")
-        users = client.execute_sql(
-            "SELECT user_id, name, email, city FROM users LIMIT 5"
-        )
-        for row in users:
-            print(f"  {row[0]}: {row[1]} ({row[2]}) - {row[3]}")
-        
-        # Query posts
-        print("\n📝 Sample Posts:")
-        posts = client.execute_sql(
-            "SELECT post_id, user_id, LEFT(title, 50) as title FROM posts LIMIT 5"
-        )
-        for row in posts:
-            print(f"  Post {row[0]} by User {row[1]}: {row[2]}...")
-        
-        # Count records
-        print("\n📈 Record Counts:")
-        counts = client.execute_sql("""
-            SELECT 
+        # Fetch the samples and the counts in one round trip
+        # Each sample is aggregated into a list of structs so it fits one row
+        result = client.execute_sql("""
+            WITH sample_users AS (
+                SELECT user_id, name, email, city FROM users LIMIT 5
+            ),
+            sample_posts AS (
+                SELECT post_id, user_id, LEFT(title, 50) as title FROM posts LIMIT 5
+            )
+            SELECT
+                (SELECT list(struct_pack(user_id := user_id, name := name, email := email, city := city))
+                    FROM sample_users) as sample_users,
+                (SELECT list(struct_pack(post_id := post_id, user_id := user_id, title := title))
+                    FROM sample_posts) as sample_posts,
                 (SELECT COUNT(*) FROM users) as user_count,
                 (SELECT COUNT(*) FROM posts) as post_count
         """)
-        for row in counts:
-            print(f"  Users: {row[0]}")
-            print(f"  Posts: {row[1]}")
+        sample_users, sample_posts, user_count, post_count = result[0]
+        
+        # Show users
+        log.info("\n📊 Sample Users:")
+        for user in sample_users:
+            log.info("  %s: %s (%s) - %s", user['user_id'], user['name'], user['email'], user['city'])
+        
+        # Show posts
+        log.info("\n📝 Sample Posts:")
+        for post in sample_posts:
+            log.info("  Post %s by User %s: %s...", post['post_id'], post['user_id'], post['title'])
+        
+        # Count records
+        log.info("\n📈 Record Counts:")
+        log.info("  Users: %s", user_count)
+        log.info("  Posts: %s", post_count)
+
+
+# Built once at import, the explainer only loops over it
+_CONCEPTS: Tuple[Tuple[str, str], ...] = (
+    ("Pipeline", "A workflow that moves data from source to destination"),
+    ("Source", "A collection of related data resources (e.g., all JSONPlaceholder endpoints)"),
+    ("Resource", "A single data entity (e.g., users, posts)"),
+    ("Destination", "Where data is loaded (e.g., BigQuery, Snowflake, DuckDB)"),
+    ("Schema", "The structure of your tables (created automatically by DLT)"),
+    ("Write Disposition", "How to handle existing data (replace, append, merge)"),
+    ("State", "Information DLT stores to track what's been loaded")
+)
 
 
 def explain_dlt_concepts():
@@ -180,23 +354,18 @@ def explain_dlt_concepts():
     Print an explanation of DLT concepts
     """
     
-    print("\n" + "=" * 60)
-    print("DLT KEY CONCEPTS")
-    print("=" * 60)
+    lines = [
+        "\n" + "=" * 60,
+        "DLT KEY CONCEPTS",
+        "=" * 60
+    ]
     
-    concepts = {
-        "Pipeline": "A workflow that moves data from source to destination",
-        "Source": "A collection of related data resources (e.g., all JSONPlaceholder endpoints)",
-        "Resource": "A single data entity (e.g., users, posts)",
-        "Destination": "Where data is loaded (e.g., BigQuery, Snowflake, DuckDB)",
-        "Schema": "The structure of your tables (created automatically by DLT)",
-        "Write Disposition": "How to handle existing data (replace, append, merge)",
-        "State": "Information DLT stores to track what's been loaded"
-    }
+    for concept, explanation in _CONCEPTS:
+        lines.append(f"\n{concept}:")
+        lines.append(f"  {explanation}")
     
-    for concept, explanation in concepts.items():
-        print(f"\n{concept}:")
-        print(f"  {explanation}")
+    # One write for the whole block instead of one per line
+    log.info("\n".join(lines))
 
 
 def show_write_dispositions():
@@ -204,25 +373,29 @@ def show_write_dispositions():
     Explain write dispositions
     """
     
-    print("\n" + "=" * 60)
-    print("WRITE DISPOSITIONS EXPLAINED")
-    print("=" * 60)
-    
-    print("\n1. REPLACE:")
-    print("   - Drops existing table and creates new one")
-    print("   - Use for: Complete refreshes, small datasets")
-    print("   - Example: Daily snapshot of all users")
-    
-    print("\n2. APPEND:")
-    print("   - Adds new rows to existing table")
-    print("   - Use for: Event logs, never-changing data")
-    print("   - Example: Transaction logs, sensor readings")
+    lines = [
+        "\n" + "=" * 60,
+        "WRITE DISPOSITIONS EXPLAINED",
+        "=" * 60,
+    
+        "\n1. REPLACE:",
+        "   - Drops existing table and creates new one",
+        "   - Use for: Complete refreshes, small datasets",
+        "   - Example: Daily snapshot of all users",
+    
+        "\n2. APPEND:",
+        "   - Adds new rows to existing table",
+        "   - Use for: Event logs, never-changing data",
+        "   - Example: Transaction logs, sensor readings",
+    
+        "\n3. MERGE:",
+        "   - Updates existing rows and adds new ones",
+        "   - Use for: Incremental updates, changing data",
+        "   - Example: User profiles that get updated",
+        "   - Requires a primary key"
+    ]
     
-    print("\n3. MERGE:")
-    print("   - Updates existing rows and adds new ones")
-    print("   - Use for: Incremental updates, changing data")
-    print("   - Example: User profiles that get updated")
-    print("   - Requires a primary key")
+    log.info("\n".join(lines))
 
 
 def main():
@@ -230,52 +403,78 @@ def main():
     Main execution function
     """
     
-    print("\n" + "🎓" * 30)
-    print("WEEK 3 - YOUR FIRST DLT PIPELINE")
-    print("🎓" * 30)
+    parser = argparse.ArgumentParser(description="Your first DLT pipeline")
+    parser.add_argument(
+        '--explain',
+        action='store_true',
+        help="print the DLT concept explanations before running the pipeline"
+    )
+    args = parser.parse_args()
+    
+    log.info("\n" + "🎓" * 30)
+    log.info("WEEK 3 - YOUR FIRST DLT PIPELINE")
+    log.info("🎓" * 30)
     
-    # Explain concepts
-    explain_dlt_concepts()
-    show_write_dispositions()
+    # Explain concepts (only on request, they are long)
+    if args.explain:
+        explain_dlt_concepts()
+        show_write_dispositions()
     
     # Run the pipeline
     run_pipeline_to_duckdb()
     
     # Summary
-    print("\n" + "=" * 60)
-    print("CONGRATULATIONS!")
-    print("=" * 60)
-    print("\n🎉 You just created your first DLT pipeline!")
-    
-    print("\n✅ What you learned:")
-    print("  1. How to create a DLT source")
-    print("  2. How to create DLT resources")
-    print("  3. How to run a pipeline")
-    print("  4. How to query loaded data")
-    
-    print("\n📂 DLT created these artifacts:")
-    print("  - jsonplaceholder_pipeline.duckdb (database file)")
-    print("  - .dlt/ folder (configuration and state)")
-    
-    print("\n🔍 Next Steps:")
-    print("  1. Check the DuckDB file with a SQL viewer")
-    print("  2. Explore the .dlt/ folder")
-    print("  3. Try modifying the resources")
-    print("  4. Run: python phase2_dlt/02_incremental_load.py")
-    
-    print("\n" + "=" * 60)
+    log.info("\n" + "=" * 60)
+    log.info("CONGRATULATIONS!")
+    log.info("=" * 60)
+    log.info("\n🎉 You just created your first DLT pipeline!")
+    
+    log.info("\n✅ What you learned:")
+    log.info("  1. How to create a DLT source")
+    log.info("  2. How to create DLT resources")
+    log.info("  3. How to run a pipeline")
+    log.info("  4. How to query loaded data")
+    
+    log.info("\n📂 DLT created these artifacts:")
+    log.info("  - jsonplaceholder_pipeline.duckdb (database file)")
+    log.info("  - .dlt/ folder (configuration and state)")
+    
+    log.info("\n🔍 Next Steps:")
+    log.info("  1. Check the DuckDB file with a SQL viewer")
+    log.info("  2. Explore the .dlt/ folder")
+    log.info("  3. Try modifying the resources")
+    log.info("  4. Run: python phase2_dlt/02_incremental_load.py")
+    
+    log.info("\n" + "=" * 60)
 
 
 if __name__ == "__main__":
+    # Buffer log records and write them out in blocks
+    # Errors flush the buffer straight away so alerts are never held back
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(message)s",
+        handlers=[logging.handlers.MemoryHandler(
+            capacity=512,
+            flushLevel=logging.ERROR,
+            target=logging.StreamHandler(sys.stdout)
+        )]
+    )
+    
     # Make sure DLT is installed
     try:
         import dlt
         main()
     except ImportError:
-        print("❌ DLT is not installed!")
-        print("\nInstall it with:")
-        print("  pip install dlt")
-        print("\nFor specific destinations:")
-        print("  pip install dlt[duckdb]")
-        print("  pip install dlt[bigquery]")
-        print("  pip install dlt[snowflake]")
+        log.error("❌ DLT is not installed!")
+        log.info("\nInstall it with:")
+        log.info("  pip install dlt")
+        log.info("\nFor specific destinations:")
+        log.info("  pip install dlt[duckdb]")
+        log.info("  pip install dlt[bigquery]")
+        log.info("  pip install dlt[snowflake]")
+    except Exception as e:
+        # Logging at ERROR flushes the buffered progress lines,
+        # so they come out before the traceback
+        log.error("\n❌ Run failed: %s", e)
+        raise
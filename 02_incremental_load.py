@@ -14,10 +14,44 @@ Incremental loading is crucial for:
 - Freshness: Get new data quickly
 """
 
+import argparse
+import logging
+import logging.handlers
+import sys
+import time
+import os
 import dlt
-from dlt.sources.helpers import requests
-from typing import Iterator, Dict, Any
-from datetime import datetime, timedelta
+from dlt.sources.helpers.requests import Client
+from typing import Iterator, Dict, Any, Tuple
+from datetime import datetime, timedelta, timezone
+import numpy as np
+import orjson
+import pyarrow as pa
+import pyarrow.compute  # noqa: F401  DLT's Arrow incremental uses pa.compute
+
+os.environ.setdefault('NORMALIZE__PARQUET_NORMALIZER__ADD_DLT_LOAD_ID', 'true')
+os.environ.setdefault('NORMALIZE__PARQUET_NORMALIZER__ADD_DLT_ID', 'true')
+
+log = logging.getLogger(__name__)
+
+
+# One client for all API calls keeps the connection alive between requests
+# DLT's client retries failed requests with exponential backoff
+_CLIENT = Client(
+    request_timeout=(3.05, 30),
+    request_max_attempts=3,
+    request_backoff_factor=2
+)
+
+POSTS_PAGE_SIZE = 1000
+
+POSTS_SCHEMA = pa.schema([
+    ('post_id', pa.int64()),
+    ('user_id', pa.int64()),
+    ('title', pa.string()),
+    ('body', pa.string()),
+    ('loaded_at', pa.timestamp('us', tz='UTC'))
+])
 
 
 @dlt.resource(
@@ -30,36 +64,85 @@ def load_posts_incremental(
         "post_id",  # The field to track
         initial_value=0  # Start from 0
     )
-) -> Iterator[Dict[str, Any]]:
+) -> Iterator[pa.Table]:
     """
     Load posts incrementally based on post_id
     
     This will only load posts newer than the last loaded post
     DLT automatically tracks the state
-    """
-    
-    print(f"\n📊 Loading posts incrementally...")
-    print(f"   Last post_id loaded: {last_post_id.last_value}")
-    
-    # Get all posts
-    response = requests.get("https://jsonplaceholder.typicode.com/posts")
-    response.raise_for_status()
-    posts = response.json()
     
-    # Filter to only new posts
-    new_posts = [p for p in posts if p['id'] > last_post_id.last_value]
-    
-    print(f"   Total posts in API: {len(posts)}")
-    print(f"   New posts to load: {len(new_posts)}")
+    All pages are deduplicated on post_id together and yielded as one table
+    """
     
-    for post in new_posts:
-        yield {
-            'post_id': post['id'],
-            'user_id': post['userId'],
-            'title': post['title'],
-            'body': post['body'],
-            'loaded_at': datetime.now().isoformat()
-        }
+    log.info("\n📊 Loading posts incrementally...")
+    log.info("   Last post_id loaded: %s", last_post_id.last_value)
+    
+    # One load timestamp for the whole run, not one per record
+    # Microseconds since the epoch fill an 8 byte TIMESTAMP column, no string to parse
+    loaded_at = pa.scalar(time.time_ns() // 1000, POSTS_SCHEMA.field('loaded_at').type)
+    
+    # Read the cursor once, DLT moves last_value forward after every
+    # yielded page and a moving id_gte would skip whole pages
+    first_id = last_post_id.last_value + 1
+    
+    # Let the API filter to only new posts and page through the result
+    # Only records newer than the last run travel over the network
+    page = 1
+    pages = []
+    while True:
+        response = _CLIENT.get(
+            "https://jsonplaceholder.typicode.com/posts",
+            params={
+                'id_gte': first_id,
+                '_page': page,
+                '_limit': POSTS_PAGE_SIZE
+            }
+        )
+        response.raise_for_status()
+        posts = orjson.loads(response.content)
+        if not posts:
+            break
+        
+        # Drop posts at or below the cursor in case the API ignored id_gte
+        # Posts come back sorted by id, so a binary search finds the cut
+        ids = np.fromiter((post['id'] for post in posts), dtype=np.int64, count=len(posts))
+        if np.any(ids[1:] < ids[:-1]):
+            order = np.argsort(ids, kind='stable')
+            posts = [posts[i] for i in order]
+            ids = ids[order]
+        cut = np.searchsorted(ids, last_post_id.last_value, side='right')
+        new_posts = posts[cut:]
+        
+        if new_posts:
+            pages.append(pa.table({
+                'post_id': [post['id'] for post in new_posts],
+                'user_id': [post['userId'] for post in new_posts],
+                'title': [post['title'] for post in new_posts],
+                'body': [post['body'] for post in new_posts],
+                'loaded_at': pa.repeat(loaded_at, len(new_posts))
+            }, schema=POSTS_SCHEMA))
+        
+        if len(posts) < POSTS_PAGE_SIZE:
+            break
+        page += 1
+    
+    total_new_posts = 0
+    if pages:
+        # Keep one row per post_id across all pages, the last one the API sent
+        # Aggregating in schema order keeps the column layout intact
+        posts_table = pa.concat_tables(pages).group_by('post_id', use_threads=False).aggregate([
+            ('user_id', 'last'),
+            ('title', 'last'),
+            ('body', 'last'),
+            ('loaded_at', 'max')
+        ]).rename_columns(POSTS_SCHEMA.names).sort_by('post_id')
+        total_new_posts = posts_table.num_rows
+        
+        # Yield the whole run as one Arrow table
+        # DLT applies the incremental cursor to Arrow tables as well
+        yield posts_table
+    
+    log.info("   New posts to load: %s", total_new_posts)
 
 
 @dlt.resource(
@@ -73,14 +156,17 @@ def load_users_with_timestamp() -> Iterator[Dict[str, Any]]:
     In real scenarios, you'd filter by updated_at timestamp
     """
     
-    print(f"\n👥 Loading users...")
+    log.info("\n👥 Loading users...")
     
-    response = requests.get("https://jsonplaceholder.typicode.com/users")
+    response = _CLIENT.get("https://jsonplaceholder.typicode.com/users")
     response.raise_for_status()
-    users = response.json()
+    users = orjson.loads(response.content)
     
-    print(f"   Found {len(users)} users")
+    log.info("   Found %s users", len(users))
     
+    # One timestamp for the whole batch, not one per record
+    # Kept as a datetime so DLT writes a TIMESTAMP without parsing a string
+    loaded_at = datetime.now(timezone.utc)
     for user in users:
         yield {
             'user_id': user['id'],
@@ -89,9 +175,9 @@ def load_users_with_timestamp() -> Iterator[Dict[str, Any]]:
             'email': user['email'],
             'city': user['address']['city'],
             'company_name': user['company']['name'],
-            'loaded_at': datetime.now().isoformat(),
+            'loaded_at': loaded_at,
             # Simulate an updated_at field
-            'updated_at': datetime.now().isoformat()
+            'updated_at': loaded_at
         }
 
 
@@ -100,9 +186,9 @@ def demonstrate_incremental_loading():
     Demonstrate how incremental loading works
     """
     
-    print("\n" + "=" * 60)
-    print("INCREMENTAL LOADING DEMONSTRATION")
-    print("=" * 60)
+    log.info("\n" + "=" * 60)
+    log.info("INCREMENTAL LOADING DEMONSTRATION")
+    log.info("=" * 60)
     
     # Create pipeline
     pipeline = dlt.pipeline(
@@ -112,15 +198,21 @@ def demonstrate_incremental_loading():
     )
     
     # First run - loads all data
-    print("\n[RUN 1] Initial load - should load all posts")
-    print("-" * 60)
+    log.info("\n[RUN 1] Initial load - should load all posts")
+    log.info("-" * 60)
     
     @dlt.source
     def posts_source():
-        return load_posts_incremental()
+        # Only posts past the post_id cursor are loaded and duplicates are
+        # already dropped in Arrow, so every row is a new key
+        # A plain append then skips the MERGE the destination would run
+        posts = load_posts_incremental()
+        posts.apply_hints(write_disposition="append")
+        return posts
     
-    load_info = pipeline.run(posts_source())
-    print(f"✅ First load completed")
+    # Parquet files are loaded by DuckDB with COPY instead of INSERT
+    load_info = pipeline.run(posts_source(), loader_file_format="parquet")
+    log.info("✅ First load completed")
     
     # Check what was loaded
     with pipeline.sql_client() as client:
@@ -128,15 +220,15 @@ def demonstrate_incremental_loading():
             "SELECT COUNT(*) as count, MAX(post_id) as max_id FROM posts_incremental"
         )
         row = list(result)[0]
-        print(f"   Records in table: {row[0]}")
-        print(f"   Highest post_id: {row[1]}")
+        log.info("   Records in table: %s", row[0])
+        log.info("   Highest post_id: %s", row[1])
     
     # Second run - should load nothing (no new data)
-    print("\n[RUN 2] Second load - should load 0 new posts")
-    print("-" * 60)
+    log.info("\n[RUN 2] Second load - should load 0 new posts")
+    log.info("-" * 60)
     
-    load_info = pipeline.run(posts_source())
-    print(f"✅ Second load completed")
+    load_info = pipeline.run(posts_source(), loader_file_format="parquet")
+    log.info("✅ Second load completed")
     
     # Check again
     with pipeline.sql_client() as client:
@@ -144,12 +236,12 @@ def demonstrate_incremental_loading():
             "SELECT COUNT(*) as count, MAX(post_id) as max_id FROM posts_incremental"
         )
         row = list(result)[0]
-        print(f"   Records in table: {row[0]}")
-        print(f"   Highest post_id: {row[1]}")
+        log.info("   Records in table: %s", row[0])
+        log.info("   Highest post_id: %s", row[1])
     
-    print("\n💡 Key Insight:")
-    print("   DLT tracked the state automatically!")
-    print("   On the second run, it knew not to reload the same data.")
+    log.info("\n💡 Key Insight:")
+    log.info("   DLT tracked the state automatically!")
+    log.info("   On the second run, it knew not to reload the same data.")
 
 
 def show_state_management():
@@ -157,25 +249,54 @@ def show_state_management():
     Show how DLT manages state
     """
     
-    print("\n" + "=" * 60)
-    print("DLT STATE MANAGEMENT")
-    print("=" * 60)
-    
-    print("\nDLT stores state in the .dlt/ directory:")
-    print("  - Pipeline configuration")
-    print("  - Last loaded values")
-    print("  - Schema versions")
-    
-    print("\nFor incremental loads, DLT tracks:")
-    print("  - Last value of incremental field (e.g., max post_id)")
-    print("  - Last run timestamp")
-    print("  - Schema changes")
-    
-    print("\nThis allows DLT to:")
-    print("  ✅ Resume from where it left off")
-    print("  ✅ Detect and load only new data")
-    print("  ✅ Handle failures gracefully")
-    print("  ✅ Support multiple concurrent pipelines")
+    lines = [
+        "\n" + "=" * 60,
+        "DLT STATE MANAGEMENT",
+        "=" * 60,
+    
+        "\nDLT stores state in the .dlt/ directory:",
+        "  - Pipeline configuration",
+        "  - Last loaded values",
+        "  - Schema versions",
+    
+        "\nFor incremental loads, DLT tracks:",
+        "  - Last value of incremental field (e.g., max post_id)",
+        "  - Last run timestamp",
+        "  - Schema changes",
+    
+        "\nThis allows DLT to:",
+        "  ✅ Resume from where it left off",
+        "  ✅ Detect and load only new data",
+        "  ✅ Handle failures gracefully",
+        "  ✅ Support multiple concurrent pipelines"
+    ]
+    
+    log.info("\n".join(lines))
+
+
+_STRATEGIES: Tuple[Tuple[str, Tuple[Tuple[str, str], ...]], ...] = (
+    ("Full Refresh (Replace)", (
+        ("How it works", "Delete all data and reload everything"),
+        ("Pros", "Simple, always in sync"),
+        ("Cons", "Slow for large datasets, high API usage"),
+        ("Best for", "Small datasets, complete snapshots"),
+        ("DLT config", "write_disposition='replace'")
+    )),
+    ("Append Only", (
+        ("How it works", "Add new records without checking for duplicates"),
+        ("Pros", "Fast, simple"),
+        ("Cons", "Can create duplicates"),
+        ("Best for", "Event logs, immutable data"),
+        ("DLT config", "write_disposition='append'")
+    )),
+    ("Incremental (Merge)", (
+        ("How it works", "Load only new/changed records, update existing"),
+        ("Pros", "Efficient, no duplicates, handles updates"),
+        ("Cons", "Requires primary key, slightly complex"),
+        ("Best for", "Most use cases"),
+        ("DLT config", "write_disposition='merge', primary_key='id'")
+    ))
+)
 
 
 def compare_load_strategies():
@@ -183,38 +304,18 @@ def compare_load_strategies():
     Compare different loading strategies
     """
     
-    print("\n" + "=" * 60)
-    print("LOADING STRATEGY COMPARISON")
-    print("=" * 60)
-    
-    strategies = {
-        "Full Refresh (Replace)": {
-            "How it works": "Delete all data and reload everything",
-            "Pros": "Simple, always in sync",
-            "Cons": "Slow for large datasets, high API usage",
-            "Best for": "Small datasets, complete snapshots",
-            "DLT config": "write_disposition='replace'"
-        },
-        "Append Only": {
-            "How it works": "Add new records without checking for duplicates",
-            "Pros": "Fast, simple",
-            "Cons": "Can create duplicates",
-            "Best for": "Event logs, immutable data",
-            "DLT config": "write_disposition='append'"
-        },
-        "Incremental (Merge)": {
-            "How it works": "Load only new/changed records, update existing",
-            "Pros": "Efficient, no duplicates, handles updates",
-            "Cons": "Requires primary key, slightly complex",
-            "Best for": "Most use cases",
-            "DLT config": "write_disposition='merge', primary_key='id'"
-        }
-    }
+    lines = [
+        "\n" + "=" * 60,
+        "LOADING STRATEGY COMPARISON",
+        "=" * 60
+    ]
     
-    for strategy, details in strategies.items():
-        print(f"\n{strategy}:")
-        for key, value in details.items():
-            print(f"  {key}: {value}")
+    for strategy, details in _STRATEGIES:
+        lines.append(f"\n{strategy}:")
+        for key, value in details:
+            lines.append(f"  {key}: {value}")
+    
+    log.info("\n".join(lines))
 
 
 def real_world_incremental_pattern():
@@ -222,9 +323,11 @@ def real_world_incremental_pattern():
     Show a real-world incremental loading pattern
     """
     
-    print("\n" + "=" * 60)
-    print("REAL-WORLD PATTERN: TIMESTAMP-BASED INCREMENTAL")
-    print("=" * 60)
+    lines = [
+        "\n" + "=" * 60,
+        "REAL-WORLD PATTERN: TIMESTAMP-BASED INCREMENTAL",
+        "=" * 60
+    ]
     
     code_example = '''
 @dlt.resource(
@@ -262,13 +365,17 @@ def load_orders_incremental(
         }
 '''
     
-    print(code_example)
+    lines += [
+        code_example,
+    
+        "\n💡 Why this pattern is great:",
+        "  ✅ Only fetches records updated since last run",
+        "  ✅ Handles updates to existing records",
+        "  ✅ Efficient use of API and warehouse",
+        "  ✅ DLT automatically tracks the timestamp"
+    ]
     
-    print("\n💡 Why this pattern is great:")
-    print("  ✅ Only fetches records updated since last run")
-    print("  ✅ Handles updates to existing records")
-    print("  ✅ Efficient use of API and warehouse")
-    print("  ✅ DLT automatically tracks the timestamp")
+    log.info("\n".join(lines))
 
 
 def main():
@@ -276,59 +383,82 @@ def main():
     Main execution function
     """
     
-    print("\n" + "⚡" * 30)
-    print("WEEK 4 - INCREMENTAL LOADING WITH DLT")
-    print("⚡" * 30)
+    parser = argparse.ArgumentParser(description="Incremental loading with DLT")
+    parser.add_argument(
+        '--explain',
+        action='store_true',
+        help="print the state and load strategy explanations around the demo"
+    )
+    args = parser.parse_args()
+    
+    log.info("\n" + "⚡" * 30)
+    log.info("WEEK 4 - INCREMENTAL LOADING WITH DLT")
+    log.info("⚡" * 30)
     
-    # Show concepts
-    show_state_management()
-    compare_load_strategies()
+    # Show concepts (only on request, they are long)
+    if args.explain:
+        show_state_management()
+        compare_load_strategies()
     
     # Run demonstration
     demonstrate_incremental_loading()
     
     # Show real-world pattern
-    real_world_incremental_pattern()
+    if args.explain:
+        real_world_incremental_pattern()
     
     # Summary
-    print("\n" + "=" * 60)
-    print("KEY TAKEAWAYS")
-    print("=" * 60)
-    
-    print("\n1. Incremental loading is essential for production")
-    print("   - Saves time and money")
-    print("   - Reduces API load")
-    print("   - Keeps data fresh")
-    
-    print("\n2. DLT makes incremental loading easy")
-    print("   - Automatic state management")
-    print("   - Built-in deduplication with merge")
-    print("   - Multiple incremental strategies")
-    
-    print("\n3. Choose the right strategy")
-    print("   - Use 'replace' for small, complete refreshes")
-    print("   - Use 'append' for immutable event logs")
-    print("   - Use 'merge' for most production use cases")
-    
-    print("\n4. Production best practices")
-    print("   - Always use primary keys with merge")
-    print("   - Track timestamps when possible")
-    print("   - Monitor state files")
-    print("   - Test incremental logic thoroughly")
-    
-    print("\n" + "=" * 60)
-    print("Next Steps:")
-    print("1. Experiment with different write dispositions")
-    print("2. Check the .dlt/ folder to see state files")
-    print("3. Try running the pipeline multiple times")
-    print("4. Ready for Week 5: Data Warehouses!")
-    print("=" * 60)
+    log.info("\n" + "=" * 60)
+    log.info("KEY TAKEAWAYS")
+    log.info("=" * 60)
+    
+    log.info("\n1. Incremental loading is essential for production")
+    log.info("   - Saves time and money")
+    log.info("   - Reduces API load")
+    log.info("   - Keeps data fresh")
+    
+    log.info("\n2. DLT makes incremental loading easy")
+    log.info("   - Automatic state management")
+    log.info("   - Deduplication with merge, or in Arrow before an append")
+    log.info("   - Multiple incremental strategies")
+    
+    log.info("\n3. Choose the right strategy")
+    log.info("   - Use 'replace' for small, complete refreshes")
+    log.info("   - Use 'append' for immutable event logs")
+    log.info("   - Use 'merge' for most production use cases")
+    
+    log.info("\n4. Production best practices")
+    log.info("   - Always use primary keys with merge")
+    log.info("   - Track timestamps when possible")
+    log.info("   - Monitor state files")
+    log.info("   - Test incremental logic thoroughly")
+    
+    log.info("\n" + "=" * 60)
+    log.info("Next Steps:")
+    log.info("1. Experiment with different write dispositions")
+    log.info("2. Check the .dlt/ folder to see state files")
+    log.info("3. Try running the pipeline multiple times")
+    log.info("4. Ready for Week 5: Data Warehouses!")
+    log.info("=" * 60)
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(message)s",
+        handlers=[logging.handlers.MemoryHandler(
+            capacity=512,
+            flushLevel=logging.ERROR,
+            target=logging.StreamHandler(sys.stdout)
+        )]
+    )
+    
     try:
         import dlt
         main()
     except ImportError:
-        print("❌ DLT is not installed!")
-        print("Install with: pip install dlt[duckdb]")
+        log.error("❌ DLT is not installed!")
+        log.info("Install with: pip install dlt[duckdb]")
+    except Exception as e:
+        log.error("\n❌ Run failed: %s", e)
+        raise
@@ -10,18 +10,175 @@ Prerequisites:
 3. Environment variables configured
 """
 
+import concurrent.futures
+import logging
+import logging.handlers
+import sys
 import dlt
-from dlt.sources.helpers import requests
-from typing import Iterator, Dict, Any
-from datetime import datetime
+from dlt.common.schema.utils import new_table
+from dlt.pipeline.exceptions import PipelineStepFailed
+from dlt.sources.helpers.requests import Client
+from google.cloud import bigquery
+from typing import Iterator, Dict, Any, Optional, List, NamedTuple, Tuple
+from datetime import datetime, timezone
+from functools import lru_cache
 import os
+import time
 from pathlib import Path
+import orjson
+import pyarrow as pa
+import pyarrow.compute as pc
+
+os.environ.setdefault('NORMALIZE__PARQUET_NORMALIZER__ADD_DLT_LOAD_ID', 'true')
+os.environ.setdefault('NORMALIZE__PARQUET_NORMALIZER__ADD_DLT_ID', 'true')
+
+log = logging.getLogger(__name__)
 
 
 # BigQuery Configuration
-BIGQUERY_CREDENTIALS = os.getenv('BIGQUERY_CREDENTIALS_PATH', './phase3_warehouses/credentials/bigquery-key.json')
-BIGQUERY_PROJECT_ID = os.getenv('BIGQUERY_PROJECT_ID', 'your-project-id')
-BIGQUERY_DATASET = os.getenv('BIGQUERY_DATASET', 'api_ingestion')
+class BigQueryConfig(NamedTuple):
+    credentials: str
+    project_id: str
+    dataset: str
+    staging_bucket: str  # e.g. gs://my-bucket/dlt-staging
+
+
+@lru_cache(maxsize=1)
+def _cfg() -> BigQueryConfig:
+    """
+    Read the BigQuery settings from the environment
+    
+    Read on first use instead of at import, then cached for the process
+    """
+    return BigQueryConfig(
+        credentials=os.getenv('BIGQUERY_CREDENTIALS_PATH', './phase3_warehouses/credentials/bigquery-key.json'),
+        project_id=os.getenv('BIGQUERY_PROJECT_ID', 'your-project-id'),
+        dataset=os.getenv('BIGQUERY_DATASET', 'api_ingestion'),
+        staging_bucket=os.getenv('BIGQUERY_STAGING_BUCKET', '')
+    )
+
+
+@lru_cache(maxsize=1)
+def _credentials_exist() -> bool:
+    """Stat the credentials file once per process"""
+    return Path(_cfg().credentials).exists()
+
+
+_CLIENT = Client(
+    request_timeout=(3.05, 30),
+    request_max_attempts=3,
+    request_backoff_factor=0.5
+)
+
+# Seconds to wait for each verification query before giving up
+VERIFICATION_TIMEOUT = 120
+
+USERS_SCHEMA = pa.schema([
+    pa.field('user_id', pa.int64(), nullable=False),
+    ('name', pa.string()),
+    ('username', pa.string()),
+    ('email', pa.string()),
+    ('phone', pa.string()),
+    ('website', pa.string()),
+    ('city', pa.string()),
+    ('zipcode', pa.string()),
+    ('latitude', pa.float64()),
+    ('longitude', pa.float64()),
+    ('company_name', pa.string()),
+    ('loaded_at', pa.timestamp('us', tz='UTC'))
+])
+
+POSTS_SCHEMA = pa.schema([
+    pa.field('post_id', pa.int64(), nullable=False),
+    ('user_id', pa.int64()),
+    ('title', pa.string()),
+    ('body', pa.string()),
+    ('title_length', pa.int64()),
+    ('body_length', pa.int64()),
+    ('loaded_at', pa.timestamp('us', tz='UTC'))
+])
+
+# Matching DLT column hints, so the BigQuery tables are created with
+# INT64 / FLOAT64 / STRING / TIMESTAMP columns without schema inference
+USERS_COLUMNS = {
+    'user_id': {'data_type': 'bigint', 'nullable': False},
+    'name': {'data_type': 'text'},
+    'username': {'data_type': 'text'},
+    'email': {'data_type': 'text'},
+    'phone': {'data_type': 'text'},
+    'website': {'data_type': 'text'},
+    'city': {'data_type': 'text'},
+    'zipcode': {'data_type': 'text'},
+    'latitude': {'data_type': 'double'},
+    'longitude': {'data_type': 'double'},
+    'company_name': {'data_type': 'text'},
+    'loaded_at': {'data_type': 'timestamp', 'precision': 6}
+}
+
+POSTS_COLUMNS = {
+    'post_id': {'data_type': 'bigint', 'nullable': False},
+    'user_id': {'data_type': 'bigint'},
+    'title': {'data_type': 'text'},
+    'body': {'data_type': 'text'},
+    'title_length': {'data_type': 'bigint'},
+    'body_length': {'data_type': 'bigint'},
+    'loaded_at': {'data_type': 'timestamp', 'precision': 6}
+}
+
+
+PHANTOM_ZERO_THRESHOLD = 0.1
+
+
+class PhantomZeroError(RuntimeError):
+    """
+    Raised when an API returns far fewer records than the previous run
+    
+    Carries the dead letter record that describes the rejected batch
+    """
+    
+    def __init__(self, dead_letter: Dict[str, Any]) -> None:
+        super().__init__(
+            f"{dead_letter['resource']}: expected about {dead_letter['expected']} "
+            f"records, got {dead_letter['got']}"
+        )
+        self.dead_letter = dead_letter
+
+
+def data_volume_sensor(resource_name: str, row_count: int) -> None:
+    """
+    Compare the incoming row count with the previous run before yielding
+    
+    With write_disposition='replace', an API outage that returns []
+    would silently empty the table (the "Phantom Zero" failure)
+    
+    The counts live in the source state: DLT resets the resource state
+    of 'replace' resources on every run
+    """
+    
+    last_counts = dlt.current.source_state().setdefault('last_counts', {})
+    last_count = last_counts.get(resource_name)
+    
+    if last_count and row_count < PHANTOM_ZERO_THRESHOLD * last_count:
+        raise PhantomZeroError({
+            'resource': resource_name,
+            'expected': last_count,
+            'got': row_count,
+            'detected_at': datetime.now(timezone.utc).isoformat()
+        })
+    
+    last_counts[resource_name] = row_count
+
+
+def find_phantom_zero(exc: BaseException) -> Optional[PhantomZeroError]:
+    """
+    Find a PhantomZeroError in the chain of exceptions DLT wraps it in
+    """
+    
+    while exc is not None:
+        if isinstance(exc, PhantomZeroError):
+            return exc
+        exc = exc.__cause__ or exc.__context__
+    return None
 
 
 def check_bigquery_setup() -> bool:
@@ -29,129 +186,160 @@ def check_bigquery_setup() -> bool:
     Check if BigQuery is properly configured
     """
     
-    print("\n" + "=" * 60)
-    print("BIGQUERY SETUP CHECK")
-    print("=" * 60)
+    log.info("\n" + "=" * 60)
+    log.info("BIGQUERY SETUP CHECK")
+    log.info("=" * 60)
     
+    cfg = _cfg()
     checks_passed = True
     
     # Check credentials file
-    print(f"\n1. Checking credentials file...")
-    if Path(BIGQUERY_CREDENTIALS).exists():
-        print(f"   ✅ Found: {BIGQUERY_CREDENTIALS}")
+    log.info("\n1. Checking credentials file...")
+    if _credentials_exist():
+        log.info("   ✅ Found: %s", cfg.credentials)
     else:
-        print(f"   ❌ Not found: {BIGQUERY_CREDENTIALS}")
-        print(f"   📝 Create a service account in Google Cloud Console")
-        print(f"   📝 Download JSON key and save to this path")
+        log.info("   ❌ Not found: %s", cfg.credentials)
+        log.info("   📝 Create a service account in Google Cloud Console")
+        log.info("   📝 Download JSON key and save to this path")
         checks_passed = False
     
     # Check project ID
-    print(f"\n2. Checking project ID...")
-    if BIGQUERY_PROJECT_ID != 'your-project-id':
-        print(f"   ✅ Project ID: {BIGQUERY_PROJECT_ID}")
+    log.info("\n2. Checking project ID...")
+    if cfg.project_id != 'your-project-id':
+        log.info("   ✅ Project ID: %s", cfg.project_id)
     else:
-        print(f"   ❌ Project ID not configured")
-        print(f"   📝 Set BIGQUERY_PROJECT_ID in .env file")
+        log.info("   ❌ Project ID not configured")
+        log.info("   📝 Set BIGQUERY_PROJECT_ID in .env file")
         checks_passed = False
     
     # Check dataset name
-    print(f"\n3. Dataset configuration...")
-    print(f"   Dataset name: {BIGQUERY_DATASET}")
+    log.info("\n3. Dataset configuration...")
+    log.info("   Dataset name: %s", cfg.dataset)
+    
+    # Check staging bucket (optional)
+    log.info("\n4. Staging bucket...")
+    if cfg.staging_bucket:
+        log.info("   ✅ Parquet files staged in: %s", cfg.staging_bucket)
+    else:
+        log.info("   ℹ️  Not set, parquet files are uploaded directly from this machine")
+        log.info("   📝 Set BIGQUERY_STAGING_BUCKET in .env to stage on GCS")
     
     if not checks_passed:
-        print("\n" + "=" * 60)
-        print("SETUP REQUIRED")
-        print("=" * 60)
-        print("\nFollow these steps:")
-        print("\n1. Go to Google Cloud Console")
-        print("   https://console.cloud.google.com/")
+        log.info("\n" + "=" * 60)
+        log.info("SETUP REQUIRED")
+        log.info("=" * 60)
+        log.info("\nFollow these steps:")
+        log.info("\n1. Go to Google Cloud Console")
+        log.info("   https://console.cloud.google.com/")
         
-        print("\n2. Create/Select a project")
-        print("   - Click project dropdown")
-        print("   - Create new project or select existing")
+        log.info("\n2. Create/Select a project")
+        log.info("   - Click project dropdown")
+        log.info("   - Create new project or select existing")
         
-        print("\n3. Enable BigQuery API")
-        print("   - Go to 'APIs & Services'")
-        print("   - Click 'Enable APIs and Services'")
-        print("   - Search 'BigQuery API'")
-        print("   - Click 'Enable'")
+        log.info("\n3. Enable BigQuery API")
+        log.info("   - Go to 'APIs & Services'")
+        log.info("   - Click 'Enable APIs and Services'")
+        log.info("   - Search 'BigQuery API'")
+        log.info("   - Click 'Enable'")
         
-        print("\n4. Create Service Account")
-        print("   - Go to 'IAM & Admin' > 'Service Accounts'")
-        print("   - Click 'Create Service Account'")
-        print("   - Name: 'dlt-bigquery'")
-        print("   - Grant role: 'BigQuery Admin'")
-        print("   - Click 'Done'")
+        log.info("\n4. Create Service Account")
+        log.info("   - Go to 'IAM & Admin' > 'Service Accounts'")
+        log.info("   - Click 'Create Service Account'")
+        log.info("   - Name: 'dlt-bigquery'")
+        log.info("   - Grant role: 'BigQuery Admin'")
+        log.info("   - Click 'Done'")
         
-        print("\n5. Create and Download Key")
-        print("   - Click on the service account")
-        print("   - Go to 'Keys' tab")
-        print("   - Click 'Add Key' > 'Create new key'")
-        print("   - Choose 'JSON'")
-        print("   - Save to: phase3_warehouses/credentials/bigquery-key.json")
+        log.info("\n5. Create and Download Key")
+        log.info("   - Click on the service account")
+        log.info("   - Go to 'Keys' tab")
+        log.info("   - Click 'Add Key' > 'Create new key'")
+        log.info("   - Choose 'JSON'")
+        log.info("   - Save to: phase3_warehouses/credentials/bigquery-key.json")
         
-        print("\n6. Update .env file")
-        print(f"   BIGQUERY_PROJECT_ID=your-actual-project-id")
-        print(f"   BIGQUERY_CREDENTIALS_PATH=./phase3_warehouses/credentials/bigquery-key.json")
+        log.info("\n6. Update .env file")
+        log.info("   BIGQUERY_PROJECT_ID=your-actual-project-id")
+        log.info("   BIGQUERY_CREDENTIALS_PATH=./phase3_warehouses/credentials/bigquery-key.json")
+        log.info("   BIGQUERY_STAGING_BUCKET=gs://your-bucket/dlt-staging  (optional)")
     
     return checks_passed
 
 
-@dlt.resource(
-    name="users",
-    write_disposition="replace"
+def users_table(users: List[Dict[str, Any]]) -> pa.Table:
+    """Flatten API users into one Arrow table"""
+    
+    # Load time as microseconds since the epoch, an 8 byte TIMESTAMP per row
+    loaded_at = pa.scalar(time.time_ns() // 1000, USERS_SCHEMA.field('loaded_at').type)
+    return pa.table({
+        'user_id': [user['id'] for user in users],
+        'name': [user['name'] for user in users],
+        'username': [user['username'] for user in users],
+        'email': [user['email'] for user in users],
+        'phone': [user['phone'] for user in users],
+        'website': [user['website'] for user in users],
+        'city': [user['address']['city'] for user in users],
+        'zipcode': [user['address']['zipcode'] for user in users],
+        # Coordinates arrive as strings, cast them in one vectorized pass
+        'latitude': pc.cast(pa.array([user['address']['geo']['lat'] for user in users], pa.string()), pa.float64()),
+        'longitude': pc.cast(pa.array([user['address']['geo']['lng'] for user in users], pa.string()), pa.float64()),
+        'company_name': [user['company']['name'] for user in users],
+        'loaded_at': pa.repeat(loaded_at, len(users))
+    }, schema=USERS_SCHEMA)
+
+
+def posts_table(posts: List[Dict[str, Any]]) -> pa.Table:
+    """Convert API posts into one Arrow table"""
+    
+    titles = pa.array([post['title'] for post in posts], pa.string())
+    bodies = pa.array([post['body'] for post in posts], pa.string())
+    
+    # Lengths are computed by Arrow over whole columns, not per row in Python
+    loaded_at = pa.scalar(time.time_ns() // 1000, POSTS_SCHEMA.field('loaded_at').type)
+    return pa.table({
+        'post_id': [post['id'] for post in posts],
+        'user_id': [post['userId'] for post in posts],
+        'title': titles,
+        'body': bodies,
+        'title_length': pc.cast(pc.utf8_length(titles), pa.int64()),
+        'body_length': pc.cast(pc.utf8_length(bodies), pa.int64()),
+        'loaded_at': pa.repeat(loaded_at, len(posts))
+    }, schema=POSTS_SCHEMA)
+
+
+# API endpoint (also the warehouse table name) and its Arrow builder
+ENDPOINTS = (
+    ("users", users_table),
+    ("posts", posts_table)
 )
-def load_users() -> Iterator[Dict[str, Any]]:
-    """Load users from API"""
-    
-    print("\n📡 Fetching users from API...")
-    response = requests.get("https://jsonplaceholder.typicode.com/users")
-    response.raise_for_status()
-    
-    users = response.json()
-    print(f"✅ Found {len(users)} users")
-    
-    for user in users:
-        yield {
-            'user_id': user['id'],
-            'name': user['name'],
-            'username': user['username'],
-            'email': user['email'],
-            'phone': user['phone'],
-            'website': user['website'],
-            'city': user['address']['city'],
-            'zipcode': user['address']['zipcode'],
-            'latitude': float(user['address']['geo']['lat']),
-            'longitude': float(user['address']['geo']['lng']),
-            'company_name': user['company']['name'],
-            'loaded_at': datetime.now().isoformat()
-        }
+
+TABLE_COLUMNS = {
+    'users': USERS_COLUMNS,
+    'posts': POSTS_COLUMNS
+}
 
 
 @dlt.resource(
-    name="posts",
+    name="jsonplaceholder",
     write_disposition="replace"
 )
-def load_posts() -> Iterator[Dict[str, Any]]:
-    """Load posts from API"""
-    
-    print("\n📡 Fetching posts from API...")
-    response = requests.get("https://jsonplaceholder.typicode.com/posts")
-    response.raise_for_status()
+def load_all() -> Iterator[pa.Table]:
+    """
+    Load users and posts from the API in one resource
     
-    posts = response.json()
-    print(f"✅ Found {len(posts)} posts")
+    A single resource means one extract pass and one keep-alive
+    connection; each yielded table is routed to its own warehouse table
+    """
     
-    for post in posts:
-        yield {
-            'post_id': post['id'],
-            'user_id': post['userId'],
-            'title': post['title'],
-            'body': post['body'],
-            'title_length': len(post['title']),
-            'body_length': len(post['body']),
-            'loaded_at': datetime.now().isoformat()
-        }
+    for endpoint, build_table in ENDPOINTS:
+        log.info("\n📡 Fetching %s from API...", endpoint)
+        response = _CLIENT.get(f"https://jsonplaceholder.typicode.com/{endpoint}")
+        response.raise_for_status()
+        
+        records = orjson.loads(response.content)
+        log.info("✅ Found %s %s", len(records), endpoint)
+        
+        data_volume_sensor(endpoint, len(records))
+        
+        yield dlt.mark.with_table_name(build_table(records), endpoint)
 
 
 @dlt.source(name="jsonplaceholder_api")
@@ -159,9 +347,19 @@ def jsonplaceholder_source():
     """
     DLT source combining all resources
     """
+    
+    # The fused resource routes data to several tables, so the column
+    # hints are declared per table on the source schema instead
+    schema = dlt.current.source_schema()
+    for table_name, columns in TABLE_COLUMNS.items():
+        schema.update_table(new_table(
+            table_name,
+            write_disposition="replace",
+            columns=[{'name': name, **hints} for name, hints in columns.items()]
+        ))
+    
     return [
-        load_users(),
-        load_posts()
+        load_all()
     ]
 
 
@@ -170,77 +368,177 @@ def run_bigquery_pipeline():
     Run the pipeline to BigQuery
     """
     
-    print("\n" + "=" * 60)
-    print("RUNNING PIPELINE TO BIGQUERY")
-    print("=" * 60)
+    log.info("\n" + "=" * 60)
+    log.info("RUNNING PIPELINE TO BIGQUERY")
+    log.info("=" * 60)
+    
+    cfg = _cfg()
+    
+    # Stage load files on GCS when a bucket is configured
+    # BigQuery then runs one load job per table straight from the bucket
+    staging = None
+    if cfg.staging_bucket:
+        staging = dlt.destinations.filesystem(
+            bucket_url=cfg.staging_bucket,
+            credentials=cfg.credentials
+        )
     
     # Create pipeline
     pipeline = dlt.pipeline(
         pipeline_name="jsonplaceholder_to_bigquery",
         destination=dlt.destinations.bigquery(
-            credentials=BIGQUERY_CREDENTIALS,
+            credentials=cfg.credentials,
             location="US"  # or "EU", "asia-southeast1", etc.
         ),
-        dataset_name=BIGQUERY_DATASET
+        staging=staging,
+        dataset_name=cfg.dataset
     )
     
-    print(f"\n📊 Pipeline Configuration:")
-    print(f"   Pipeline: {pipeline.pipeline_name}")
-    print(f"   Destination: BigQuery")
-    print(f"   Project: {BIGQUERY_PROJECT_ID}")
-    print(f"   Dataset: {BIGQUERY_DATASET}")
-    print(f"   Location: US")
+    log.info("\n📊 Pipeline Configuration:")
+    log.info("   Pipeline: %s", pipeline.pipeline_name)
+    log.info("   Destination: BigQuery")
+    log.info("   Project: %s", cfg.project_id)
+    log.info("   Dataset: %s", cfg.dataset)
+    log.info("   Location: US")
+    log.info("   Staging: %s", cfg.staging_bucket or 'none (direct upload)')
     
     # Run the pipeline
-    print(f"\n🚀 Starting data load...")
+    log.info("\n🚀 Starting data load...")
     
-    load_info = pipeline.run(jsonplaceholder_source())
+    # Each table is written to one parquet file and ingested with a
+    # BigQuery load job instead of row-by-row inserts
+    try:
+        load_info = pipeline.run(jsonplaceholder_source(), loader_file_format="parquet")
+    except PipelineStepFailed as exc:
+        phantom_zero = find_phantom_zero(exc)
+        if phantom_zero is None:
+            raise
+        
+        log.error("\n🚨 Data volume check failed: %s", phantom_zero)
+        pipeline.run([phantom_zero.dead_letter], table_name="dlq", write_disposition="append")
+        log.info("   Rejected batch recorded in the dlq table")
+        raise
     
     # Print results
-    print("\n" + "=" * 60)
-    print("LOAD COMPLETED")
-    print("=" * 60)
+    log.info("\n" + "=" * 60)
+    log.info("LOAD COMPLETED")
+    log.info("=" * 60)
     
-    print(f"\n✅ Tables created in BigQuery:")
+    log.info("\n✅ Tables created in BigQuery:")
     for package in load_info.load_packages:
         for table_name in package.schema_update.keys():
-            full_table = f"{BIGQUERY_PROJECT_ID}.{BIGQUERY_DATASET}.{table_name}"
-            print(f"   📊 {full_table}")
+            full_table = f"{cfg.project_id}.{cfg.dataset}.{table_name}"
+            log.info("   📊 %s", full_table)
     
     # Show next steps
-    print("\n" + "=" * 60)
-    print("QUERY YOUR DATA IN BIGQUERY")
-    print("=" * 60)
+    log.info("\n" + "=" * 60)
+    log.info("QUERY YOUR DATA IN BIGQUERY")
+    log.info("=" * 60)
+    
+    log.info("\n1. Open BigQuery Console:")
+    log.info("   https://console.cloud.google.com/bigquery")
     
-    print(f"\n1. Open BigQuery Console:")
-    print(f"   https://console.cloud.google.com/bigquery")
+    log.info("\n2. Navigate to your dataset:")
+    log.info("   %s > %s", cfg.project_id, cfg.dataset)
     
-    print(f"\n2. Navigate to your dataset:")
-    print(f"   {BIGQUERY_PROJECT_ID} > {BIGQUERY_DATASET}")
+    log.info("\n3. Try these queries:")
     
-    print(f"\n3. Try these queries:")
+    queries = example_queries()
     
-    queries = [
-        ("Count users", f"SELECT COUNT(*) as user_count FROM `{BIGQUERY_PROJECT_ID}.{BIGQUERY_DATASET}.users`"),
-        ("Get top cities", f"SELECT city, COUNT(*) as count FROM `{BIGQUERY_PROJECT_ID}.{BIGQUERY_DATASET}.users` GROUP BY city ORDER BY count DESC"),
-        ("Posts per user", f"SELECT user_id, COUNT(*) as post_count FROM `{BIGQUERY_PROJECT_ID}.{BIGQUERY_DATASET}.posts` GROUP BY user_id ORDER BY post_count DESC"),
+    for i, (description, query) in enumerate(queries, 1):
+        log.info("\n   Query %s: %s", i, description)
+        log.info("   ```sql")
+        log.info("   %s", query)
+        log.info("   ```")
+    
+    return pipeline
+
+
+def example_queries() -> List[Tuple[str, str]]:
+    """
+    Example queries over the loaded tables, as (description, SQL) pairs
+    """
+    
+    cfg = _cfg()
+    return [
+        ("Count users", f"SELECT COUNT(*) as user_count FROM `{cfg.project_id}.{cfg.dataset}.users`"),
+        ("Get top cities", f"SELECT city, COUNT(*) as count FROM `{cfg.project_id}.{cfg.dataset}.users` GROUP BY city ORDER BY count DESC"),
+        ("Posts per user", f"SELECT user_id, COUNT(*) as post_count FROM `{cfg.project_id}.{cfg.dataset}.posts` GROUP BY user_id ORDER BY post_count DESC"),
         ("Join users and posts", f"""SELECT 
     u.name,
     u.email,
     COUNT(p.post_id) as post_count
-FROM `{BIGQUERY_PROJECT_ID}.{BIGQUERY_DATASET}.users` u
-LEFT JOIN `{BIGQUERY_PROJECT_ID}.{BIGQUERY_DATASET}.posts` p ON u.user_id = p.user_id
+FROM `{cfg.project_id}.{cfg.dataset}.users` u
+LEFT JOIN `{cfg.project_id}.{cfg.dataset}.posts` p ON u.user_id = p.user_id
 GROUP BY u.name, u.email
 ORDER BY post_count DESC""")
     ]
+
+
+def run_verification_queries(pipeline, queries: List[Tuple[str, str]]) -> None:
+    """
+    Run verification queries against BigQuery as batch jobs
     
-    for i, (description, query) in enumerate(queries, 1):
-        print(f"\n   Query {i}: {description}")
-        print(f"   ```sql")
-        print(f"   {query}")
-        print(f"   ```")
+    All jobs are submitted before any result is awaited, so BigQuery
+    runs them side by side instead of one after another
     
-    return pipeline
+    Batch jobs can wait in BigQuery's queue, so each result is awaited
+    for at most VERIFICATION_TIMEOUT seconds
+    """
+    
+    # Batch priority and the query cache keep repeated runs cheap
+    job_config = bigquery.QueryJobConfig(
+        priority=bigquery.QueryPriority.BATCH,
+        use_query_cache=True
+    )
+    
+    with pipeline.sql_client() as client:
+        bq_client = client.native_connection
+        
+        jobs = [
+            (description, bq_client.query(query, job_config=job_config))
+            for description, query in queries
+        ]
+        
+        try:
+            for description, job in jobs:
+                rows = list(job.result(timeout=VERIFICATION_TIMEOUT))
+                log.info("\n   %s: %s rows", description, len(rows))
+                for row in rows[:3]:
+                    log.info("     %s", dict(row.items()))
+        finally:
+            # Don't leave queued jobs behind after a timeout or error
+            for _, job in jobs:
+                if not job.done():
+                    job.cancel()
+
+
+# Pairs instead of dicts so repeated keys (the two tips) both survive
+_FEATURES: Tuple[Tuple[str, Tuple[Tuple[str, str], ...]], ...] = (
+    ("Partitioning", (
+        ("What", "Split tables by date/timestamp for faster queries"),
+        ("Example", "Partition by loaded_at date"),
+        ("Benefit", "Query only relevant partitions, save cost")
+    )),
+    ("Clustering", (
+        ("What", "Sort data within partitions"),
+        ("Example", "Cluster by user_id or city"),
+        ("Benefit", "Even faster queries and lower cost")
+    )),
+    ("Cost Control", (
+        ("What", "BigQuery charges by data scanned"),
+        ("Tip", "Use SELECT specific columns, not SELECT *"),
+        ("Tip", "Use WHERE clauses to filter partitions")
+    )),
+    ("Data Types", (
+        ("What", "BigQuery has specific data types"),
+        ("STRING", "For text data"),
+        ("INT64", "For whole numbers"),
+        ("FLOAT64", "For decimals"),
+        ("TIMESTAMP", "For dates/times"),
+        ("GEOGRAPHY", "For location data")
+    ))
+)
 
 
 def demonstrate_bigquery_features():
@@ -248,40 +546,14 @@ def demonstrate_bigquery_features():
     Show BigQuery-specific features and best practices
     """
     
-    print("\n" + "=" * 60)
-    print("BIGQUERY FEATURES & BEST PRACTICES")
-    print("=" * 60)
-    
-    features = {
-        "Partitioning": {
-            "What": "Split tables by date/timestamp for faster queries",
-            "Example": "Partition by loaded_at date",
-            "Benefit": "Query only relevant partitions, save cost"
-        },
-        "Clustering": {
-            "What": "Sort data within partitions",
-            "Example": "Cluster by user_id or city",
-            "Benefit": "Even faster queries and lower cost"
-        },
-        "Cost Control": {
-            "What": "BigQuery charges by data scanned",
-            "Tip": "Use SELECT specific columns, not SELECT *",
-            "Tip": "Use WHERE clauses to filter partitions"
-        },
-        "Data Types": {
-            "What": "BigQuery has specific data types",
-            "STRING": "For text data",
-            "INT64": "For whole numbers",
-            "FLOAT64": "For decimals",
-            "TIMESTAMP": "For dates/times",
-            "GEOGRAPHY": "For location data"
-        }
-    }
-    
-    for feature, details in features.items():
-        print(f"\n{feature}:")
-        for key, value in details.items():
-            print(f"  {key}: {value}")
+    log.info("\n" + "=" * 60)
+    log.info("BIGQUERY FEATURES & BEST PRACTICES")
+    log.info("=" * 60)
+    
+    for feature, details in _FEATURES:
+        log.info("\n%s:", feature)
+        for key, value in details:
+            log.info("  %s: %s", key, value)
 
 
 def show_cost_estimation():
@@ -289,25 +561,25 @@ def show_cost_estimation():
     Show how to estimate BigQuery costs
     """
     
-    print("\n" + "=" * 60)
-    print("BIGQUERY COST ESTIMATION")
-    print("=" * 60)
-    
-    print("\nBigQuery Pricing (as of 2024):")
-    print("  Storage: $0.02 per GB per month")
-    print("  Queries: $5 per TB scanned")
-    print("  First 1 TB per month: FREE")
-    print("  First 10 GB storage: FREE")
-    
-    print("\nFor this project:")
-    print("  Data size: ~100 KB (very small)")
-    print("  Monthly cost: $0 (well within free tier)")
-    
-    print("\nCost Optimization Tips:")
-    print("  1. Use partitioned tables")
-    print("  2. Query only needed columns")
-    print("  3. Use LIMIT for testing")
-    print("  4. Monitor with Billing Reports")
+    log.info("\n" + "=" * 60)
+    log.info("BIGQUERY COST ESTIMATION")
+    log.info("=" * 60)
+    
+    log.info("\nBigQuery Pricing (as of 2024):")
+    log.info("  Storage: $0.02 per GB per month")
+    log.info("  Queries: $5 per TB scanned")
+    log.info("  First 1 TB per month: FREE")
+    log.info("  First 10 GB storage: FREE")
+    
+    log.info("\nFor this project:")
+    log.info("  Data size: ~100 KB (very small)")
+    log.info("  Monthly cost: $0 (well within free tier)")
+    
+    log.info("\nCost Optimization Tips:")
+    log.info("  1. Use partitioned tables")
+    log.info("  2. Query only needed columns")
+    log.info("  3. Use LIMIT for testing")
+    log.info("  4. Monitor with Billing Reports")
 
 
 def main():
@@ -315,13 +587,13 @@ def main():
     Main execution
     """
     
-    print("\n" + "🌥️ " * 30)
-    print("BIGQUERY PIPELINE - CLOUD DATA WAREHOUSE")
-    print("🌥️ " * 30)
+    log.info("\n" + "🌥️ " * 30)
+    log.info("BIGQUERY PIPELINE - CLOUD DATA WAREHOUSE")
+    log.info("🌥️ " * 30)
     
     # Check setup
     if not check_bigquery_setup():
-        print("\n⚠️  Please complete setup steps above first.")
+        log.info("\n⚠️  Please complete setup steps above first.")
         return
     
     # Show features
@@ -331,28 +603,55 @@ def main():
     # Run pipeline
     try:
         pipeline = run_bigquery_pipeline()
-        
-        print("\n" + "=" * 60)
-        print("SUCCESS! 🎉")
-        print("=" * 60)
-        print("\n✅ Your data is now in BigQuery!")
-        print("✅ You can query it with SQL")
-        print("✅ You can connect BI tools (Looker, Tableau, etc.)")
-        print("✅ You can share datasets with your team")
-        
     except Exception as e:
-        print(f"\n❌ Error running pipeline: {e}")
-        print("\nTroubleshooting:")
-        print("1. Check credentials file exists and is valid")
-        print("2. Verify project ID is correct")
-        print("3. Ensure BigQuery API is enabled")
-        print("4. Check service account has BigQuery Admin role")
+        log.exception("\n❌ Error running pipeline: %s", e)
+        log.info("\nTroubleshooting:")
+        log.info("1. Check credentials file exists and is valid")
+        log.info("2. Verify project ID is correct")
+        log.info("3. Ensure BigQuery API is enabled")
+        log.info("4. Check service account has BigQuery Admin role")
+        return
+    
+    # Verify as a separate step, the data is already loaded at this point
+    # so a slow or failing query is not a failed pipeline
+    log.info("\n" + "=" * 60)
+    log.info("VERIFYING THE LOAD")
+    log.info("=" * 60)
+    try:
+        run_verification_queries(pipeline, example_queries())
+    except concurrent.futures.TimeoutError:
+        log.warning("\n⚠️  Verification queries still queued after %s seconds", VERIFICATION_TIMEOUT)
+        log.info("   The data is loaded, run the queries above in the console")
+    except Exception as e:
+        log.warning("\n⚠️  Verification queries did not finish: %s", e)
+        log.info("   The data is loaded, run the queries above in the console")
+    
+    log.info("\n" + "=" * 60)
+    log.info("SUCCESS! 🎉")
+    log.info("=" * 60)
+    log.info("\n✅ Your data is now in BigQuery!")
+    log.info("✅ You can query it with SQL")
+    log.info("✅ You can connect BI tools (Looker, Tableau, etc.)")
+    log.info("✅ You can share datasets with your team")
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(message)s",
+        handlers=[logging.handlers.MemoryHandler(
+            capacity=512,
+            flushLevel=logging.ERROR,
+            target=logging.StreamHandler(sys.stdout)
+        )]
+    )
+    
     try:
         import dlt
         main()
     except ImportError:
-        print("❌ DLT not installed!")
-        print("Install with: pip install 'dlt[bigquery]'")
+        log.error("❌ DLT not installed!")
+        log.info("Install with: pip install 'dlt[bigquery]'")
+    except Exception as e:
+        log.error("\n❌ Run failed: %s", e)
+        raise